@@ -1,25 +1,17 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import streamlit_authenticator as stauth
 import yaml
 from yaml.loader import SafeLoader
-import psycopg2
-from psycopg2 import sql
+from psycopg_pool import ConnectionPool
 import datetime
+import gc
+import threading
 import warnings
+from types import MappingProxyType
 import bcrypt
 
-# Import pipeline with error handling
-try:
-    from transformers import pipeline
-except ImportError:
-    try:
-        from transformers.pipelines import pipeline
-    except ImportError as e:
-        st.error(f"Failed to import transformers: {e}")
-        st.stop()
-
 # Must be the first Streamlit command
 st.set_page_config(
     layout="wide",
@@ -37,13 +29,21 @@ logging.getLogger('streamlit').setLevel(logging.ERROR)
 # 1. CONFIGURATION AND AUTHENTICATION SETUP
 # =======================================================
 
-# --- Initialize Database Connection (needs to be before auth to load users) ---
+# --- Initialize Database Connection Pool (needs to be before auth to load users) ---
 @st.cache_resource
-def init_db_connection():
+def init_db_pool():
     try:
-        # Connect using the DATABASE_URL secret
-        conn = psycopg2.connect(st.secrets["DATABASE_URL"])
-        return conn
+        # Connect using the DATABASE_URL secret; statements executed 5+ times
+        # on a connection are prepared server-side automatically
+        pool = ConnectionPool(
+            st.secrets["DATABASE_URL"],
+            min_size=1,
+            max_size=5,
+            kwargs={"prepare_threshold": 5},
+            open=True
+        )
+        pool.wait()
+        return pool
     except Exception as e:
         st.error("Database connection failed. Please check your 'DATABASE_URL' secret/environment variable.")
         st.error(f"Details: {e}")
@@ -68,89 +68,180 @@ except Exception as e:
     st.error(f"Error loading configuration: {e}")
     st.stop()
 
-# --- Load NLP Pipeline (Hugging Face) ---
+# --- Load NLP Model (Hugging Face) ---
+EMOTION_MODEL_NAME = "j-hartmann/emotion-english-distilroberta-base"
+# Inputs are truncated to this many tokens to bound worst-case attention cost;
+# journal entries are capped at 300 characters, which fits well within 128
+EMOTION_MAX_TOKENS = 128
+
 @st.cache_resource
-def load_emotion_pipeline():
-    return pipeline(
-        "text-classification",
-        model="j-hartmann/emotion-english-distilroberta-base",
-        top_k=None
+def load_emotion_model():
+    """Loads the emotion tokenizer and model once: FP16 on GPU, INT8-quantized on CPU."""
+    # Heavy ML imports are deferred until the model is first needed, so the
+    # login page never pays for them
+    try:
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    except ImportError as e:
+        st.error(f"Failed to import transformers: {e}")
+        st.stop()
+
+    # ONNX Runtime backend is opt-in: it is used only when optimum[onnxruntime] is
+    # installed separately (it is not in requirements.txt). The export is FP32 and
+    # redone on every cold start, so the INT8 PyTorch model stays the CPU default
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError:
+        ORTModelForSequenceClassification = None
+
+    use_cuda = torch.cuda.is_available()
+    # Rust-backed fast tokenizer; the slow Python one can rival the model cost on short texts
+    tokenizer = AutoTokenizer.from_pretrained(EMOTION_MODEL_NAME, use_fast=True)
+
+    if not use_cuda and ORTModelForSequenceClassification is not None:
+        # Export to ONNX once per process; ORT applies graph fusions and picks
+        # the best CPU kernels (AVX2/AVX-512/VNNI) automatically
+        model = ORTModelForSequenceClassification.from_pretrained(EMOTION_MODEL_NAME, export=True)
+        return tokenizer, model, model.config.id2label
+
+    # Load weights directly in the target dtype without a full FP32 staging copy
+    model = AutoModelForSequenceClassification.from_pretrained(
+        EMOTION_MODEL_NAME,
+        low_cpu_mem_usage=True,
+        torch_dtype=torch.float16 if use_cuda else torch.float32
     )
+    model.eval()
+
+    if use_cuda:
+        model = model.to("cuda")
+    else:
+        # INT8 weights for the Linear layers; activations are quantized on the fly
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    # Release buffers left over from loading/quantization
+    gc.collect()
+    if use_cuda:
+        torch.cuda.empty_cache()
+
+    return tokenizer, model, model.config.id2label
+
+# Column names of the per-user history DataFrame, in journal_entries column order
+HISTORY_COLUMNS = [
+    'Date', 'Period Day', 'Summary', 'Emotion Label', 'Confidence Score',
+    'Joy_Score', 'Sadness_Score', 'Anger_Score', 'Fear_Score', 'Surprise_Score', 'Disgust_Score', 'Neutral_Score',
+    'Symptom_Cramps', 'Symptom_Headache', 'Symptom_Bloating', 'Symptom_Fatigue', 'Symptom_Acne',
+    'Symptom_Back_Pain', 'Symptom_Nausea', 'Symptom_Breast_Tenderness', 'Symptom_Mood_Swings', 'Symptom_Insomnia'
+]
+
+# Emotion labels in journal_entries score-column order
+EMOTION_LABELS = ('joy', 'sadness', 'anger', 'fear', 'surprise', 'disgust', 'neutral')
+
+# Per-emotion score columns, stored (with Confidence Score) as float32 in the history DataFrame
+EMOTION_SCORE_COLUMNS = [f"{label.capitalize()}_Score" for label in EMOTION_LABELS]
+
+# Fixed categories so loaded and appended history frames concatenate as one categorical
+EMOTION_LABEL_DTYPE = pd.CategoricalDtype(EMOTION_LABELS)
 
 # --- Core Functions ---
 
+# Emotion-specific content
+_EMOTION_DATA = {
+    'joy': {
+        'quote': "Your joy is your sorrow unmasked. - Kahlil Gibran",
+        'tip': "Celebrate this feeling! Consider journaling about what brought you joy today.",
+        'color': '#FFD700',
+        'emoji': '😊'
+    },
+    'sadness': {
+        'quote': "It's okay to not be okay. Be gentle with yourself today.",
+        'tip': "Try gentle movement like stretching or a short walk. Reach out to someone you trust.",
+        'color': '#4169E1',
+        'emoji': '💙'
+    },
+    'anger': {
+        'quote': "Your feelings are valid. Take time to understand what you need.",
+        'tip': "Try deep breathing exercises. Count to 10 before reacting. Physical activity can help release tension.",
+        'color': '#FF6B35',
+        'emoji': '🔥'
+    },
+    'fear': {
+        'quote': "Courage is not the absence of fear, but the triumph over it.",
+        'tip': "Ground yourself with the 5-4-3-2-1 technique. Name 5 things you can see, 4 you can touch, 3 you can hear, 2 you can smell, 1 you can taste.",
+        'color': '#7B68EE',
+        'emoji': '💜'
+    },
+    'surprise': {
+        'quote': "Life is full of surprises. Embrace the unexpected with curiosity.",
+        'tip': "Take a moment to reflect on what surprised you and what you can learn from it.",
+        'color': '#FF8C00',
+        'emoji': '✨'
+    },
+    'disgust': {
+        'quote': "Listen to your boundaries. They're protecting you.",
+        'tip': "It's okay to step away from what doesn't feel right. Honor your feelings and set healthy boundaries.",
+        'color': '#32CD32',
+        'emoji': '🌿'
+    },
+    'neutral': {
+        'quote': "Sometimes the most productive thing you can do is rest.",
+        'tip': "Neutral days are perfectly normal. Use this calm to check in with yourself.",
+        'color': '#9E9E9E',
+        'emoji': '🌸'
+    }
+}
+
+# Cycle-specific advice
+_CYCLE_TIPS = {
+    1: "Day 1 can be challenging. Rest is productive. Stay hydrated and be extra kind to yourself.",
+    2: "Your body is working hard. Gentle movement and warm compresses can help with discomfort.",
+    3: "You're past the hardest part. Notice if your energy is starting to shift.",
+    4: "Energy may be returning. Listen to your body's signals.",
+    5: "Notice how you're feeling. Many people start feeling lighter around now.",
+    6: "You might notice increased energy. It's a great time for activities you enjoy.",
+    7: "The final stretch. Reflect on your cycle and what you've learned about yourself."
+}
+
+_DEFAULT_CYCLE_TIP = "Remember to listen to your body and honor your needs."
+
+# Every (emotion, cycle day) combination, built once at import (read-only)
+_EMOTION_CONTENT = {
+    (emotion, day): MappingProxyType({**data, 'cycle_advice': tip})
+    for emotion, data in _EMOTION_DATA.items()
+    for day, tip in _CYCLE_TIPS.items()
+}
+
 def get_emotion_content(emotion, cycle_day):
     """Returns personalized quotes, tips, and advice based on emotion and cycle day."""
+    emotion = emotion.lower()
+    content = _EMOTION_CONTENT.get((emotion, cycle_day))
+    if content is None:
+        # Unknown emotion or a day outside 1-7: same fallbacks as the tables
+        data = _EMOTION_DATA.get(emotion, _EMOTION_DATA['neutral'])
+        content = {**data, 'cycle_advice': _CYCLE_TIPS.get(cycle_day, _DEFAULT_CYCLE_TIP)}
+    return content
 
-    emotion_data = {
-        'joy': {
-            'quote': "Your joy is your sorrow unmasked. - Kahlil Gibran",
-            'tip': "Celebrate this feeling! Consider journaling about what brought you joy today.",
-            'color': '#FFD700',
-            'emoji': '😊'
-        },
-        'sadness': {
-            'quote': "It's okay to not be okay. Be gentle with yourself today.",
-            'tip': "Try gentle movement like stretching or a short walk. Reach out to someone you trust.",
-            'color': '#4169E1',
-            'emoji': '💙'
-        },
-        'anger': {
-            'quote': "Your feelings are valid. Take time to understand what you need.",
-            'tip': "Try deep breathing exercises. Count to 10 before reacting. Physical activity can help release tension.",
-            'color': '#FF6B35',
-            'emoji': '🔥'
-        },
-        'fear': {
-            'quote': "Courage is not the absence of fear, but the triumph over it.",
-            'tip': "Ground yourself with the 5-4-3-2-1 technique. Name 5 things you can see, 4 you can touch, 3 you can hear, 2 you can smell, 1 you can taste.",
-            'color': '#7B68EE',
-            'emoji': '💜'
-        },
-        'surprise': {
-            'quote': "Life is full of surprises. Embrace the unexpected with curiosity.",
-            'tip': "Take a moment to reflect on what surprised you and what you can learn from it.",
-            'color': '#FF8C00',
-            'emoji': '✨'
-        },
-        'disgust': {
-            'quote': "Listen to your boundaries. They're protecting you.",
-            'tip': "It's okay to step away from what doesn't feel right. Honor your feelings and set healthy boundaries.",
-            'color': '#32CD32',
-            'emoji': '🌿'
-        },
-        'neutral': {
-            'quote': "Sometimes the most productive thing you can do is rest.",
-            'tip': "Neutral days are perfectly normal. Use this calm to check in with yourself.",
-            'color': '#9E9E9E',
-            'emoji': '🌸'
-        }
-    }
-
-    # Cycle-specific advice
-    cycle_tips = {
-        1: "Day 1 can be challenging. Rest is productive. Stay hydrated and be extra kind to yourself.",
-        2: "Your body is working hard. Gentle movement and warm compresses can help with discomfort.",
-        3: "You're past the hardest part. Notice if your energy is starting to shift.",
-        4: "Energy may be returning. Listen to your body's signals.",
-        5: "Notice how you're feeling. Many people start feeling lighter around now.",
-        6: "You might notice increased energy. It's a great time for activities you enjoy.",
-        7: "The final stretch. Reflect on your cycle and what you've learned about yourself."
-    }
+@st.cache_data(max_entries=512, show_spinner=False)
+def _classify(text):
+    """Runs the emotion model on a single text; repeated texts are served from the cache."""
+    import torch
 
-    content = emotion_data.get(emotion.lower(), emotion_data['neutral'])
-    content['cycle_advice'] = cycle_tips.get(cycle_day, "Remember to listen to your body and honor your needs.")
+    tokenizer, model, id2label = load_emotion_model()
+    enc = tokenizer(text, return_tensors="pt", truncation=True, max_length=EMOTION_MAX_TOKENS).to(model.device)
+    with torch.inference_mode():
+        logits = model(**enc).logits[0]
+    probs = logits.float().softmax(-1)
 
-    return content
+    return [{'label': id2label[i], 'score': float(probs[i])} for i in range(len(probs))]
 
-def analyze_emotion(text, emotion_analyzer):
+def analyze_emotion(text):
     """Analyzes text using the HuggingFace model and returns the result."""
-    results = emotion_analyzer(text)[0]
+    results = _classify(text)
     top_emotion = max(results, key=lambda x: x['score'])
     return top_emotion['label'], top_emotion['score'], results
 
-def create_table_if_not_exists(conn):
-    """Ensures the required database tables exist."""
+@st.cache_resource(show_spinner=False)
+def create_table_if_not_exists(_pool):
+    """Ensures the required database tables exist, once per process."""
     # Journal entries table
     CREATE_JOURNAL_TABLE_SQL = """
     CREATE TABLE IF NOT EXISTS journal_entries (
@@ -230,14 +321,19 @@ def create_table_if_not_exists(conn):
     END $$;
     """
 
-    with conn.cursor() as cur:
+    # Index for per-user history lookups (WHERE user_id = ... ORDER BY entry_date DESC)
+    CREATE_JOURNAL_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_journal_user_date ON journal_entries (user_id, entry_date DESC);
+    """
+
+    with _pool.connection() as conn, conn.cursor() as cur:
         cur.execute(CREATE_JOURNAL_TABLE_SQL)
         cur.execute(CREATE_USERS_TABLE_SQL)
         cur.execute(ADD_COUNTRY_COLUMN_SQL)
         cur.execute(ADD_SYMPTOM_COLUMNS_SQL)
-        conn.commit()
+        cur.execute(CREATE_JOURNAL_INDEX_SQL)
 
-def register_user(conn, username, email, name, password_hash, country=None):
+def register_user(pool, username, email, name, password_hash, country=None):
     """Register a new user in the database."""
     query = """
     INSERT INTO users (username, email, name, password_hash, country)
@@ -245,13 +341,12 @@ def register_user(conn, username, email, name, password_hash, country=None):
     RETURNING id;
     """
     try:
-        with conn.cursor() as cur:
+        # The connection context commits on success and rolls back on error
+        with pool.connection() as conn, conn.cursor() as cur:
             cur.execute(query, [username, email, name, password_hash, country])
             user_id = cur.fetchone()[0]
-            conn.commit()
         return True, user_id
     except Exception as e:
-        conn.rollback()
         if "duplicate key" in str(e).lower():
             if "username" in str(e).lower():
                 return False, "Username already exists"
@@ -259,32 +354,33 @@ def register_user(conn, username, email, name, password_hash, country=None):
                 return False, "Email already exists"
         return False, str(e)
 
-def load_users_from_db(conn):
+def load_users_from_db(pool):
     """Load all users from database and format for streamlit-authenticator."""
     query = "SELECT username, email, name, password_hash FROM users;"
-    try:
-        with conn.cursor() as cur:
-            cur.execute(query)
-            rows = cur.fetchall()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(query)
+        rows = cur.fetchall()
+
+    # Format for streamlit-authenticator
+    users_dict = {}
+    for username, email, name, password_hash in rows:
+        users_dict[username] = {
+            'email': email,
+            'name': name,
+            'password': password_hash
+        }
+    return users_dict
 
-        # Format for streamlit-authenticator
-        users_dict = {}
-        for username, email, name, password_hash in rows:
-            users_dict[username] = {
-                'email': email,
-                'name': name,
-                'password': password_hash
-            }
-        return users_dict
-    except Exception:
-        # If table doesn't exist or error, return empty dict
-        return {}
+@st.cache_data(ttl=60, show_spinner=False)
+def load_users_from_db_cached(_pool):
+    """Cached load_users_from_db so the users table is scanned at most once a minute."""
+    return load_users_from_db(_pool)
 
-def get_user_locations(conn):
+def get_user_locations(pool):
     """Get user locations for world map visualization."""
     query = "SELECT country, COUNT(*) as user_count FROM users WHERE country IS NOT NULL GROUP BY country;"
     try:
-        with conn.cursor() as cur:
+        with pool.connection() as conn, conn.cursor() as cur:
             cur.execute(query)
             rows = cur.fetchall()
 
@@ -300,32 +396,32 @@ def calculate_streak(df):
     if df.empty:
         return 0
 
-    # Get unique dates (date only, not time)
-    dates = pd.to_datetime(df['Date']).dt.date.unique()
-    dates = sorted(dates, reverse=True)
+    # Unique calendar days, oldest first, as day-resolution datetime64
+    dates = (
+        pd.to_datetime(df['Date']).dt.normalize()
+        .drop_duplicates()
+        .sort_values()
+        .to_numpy('datetime64[D]')
+    )
 
-    if len(dates) == 0:
+    if dates.size == 0:
         return 0
 
     # Check if there's an entry today or yesterday
-    from datetime import date, timedelta
-    today = date.today()
-    yesterday = today - timedelta(days=1)
-
-    if dates[0] not in [today, yesterday]:
+    today = np.datetime64(datetime.date.today(), 'D')
+    if (today - dates[-1]).astype('int64') not in (0, 1):
         return 0  # Streak broken
 
-    # Count consecutive days
-    streak = 1
-    for i in range(len(dates) - 1):
-        diff = (dates[i] - dates[i + 1]).days
-        if diff == 1:
-            streak += 1
-        else:
-            break
+    # The streak starts right after the last gap longer than one day
+    gaps = np.diff(dates).astype('int64')
+    breaks = np.flatnonzero(gaps > 1)
+    return int(dates.size - (breaks[-1] + 1 if breaks.size else 0))
 
-    return streak
+def _history_hash(df):
+    """Cheap hash for history frames: row count plus the newest (serial) id."""
+    return (len(df), int(df['id'].max()) if len(df) else 0)
 
+@st.cache_data(ttl="1h", max_entries=256, show_spinner=False, hash_funcs={pd.DataFrame: _history_hash})
 def get_insights(df):
     """Generate insights from the user's mood data."""
     if df.empty or len(df) < 3:
@@ -334,11 +430,12 @@ def get_insights(df):
     insights = {}
 
     # Most common emotion
-    insights['most_common_emotion'] = df['Emotion Label'].mode()[0] if len(df['Emotion Label'].mode()) > 0 else None
+    emotion_counts = df['Emotion Label'].value_counts()
+    insights['most_common_emotion'] = emotion_counts.index[0] if not emotion_counts.empty else None
 
     # Best day (highest average confidence for positive emotions)
     if 'Period Day' in df.columns:
-        day_avg = df.groupby('Period Day')['Confidence Score'].mean()
+        day_avg = df.groupby('Period Day', sort=False)['Confidence Score'].mean()
         insights['best_day'] = int(day_avg.idxmax()) if not day_avg.empty else None
 
     # Total entries
@@ -346,218 +443,314 @@ def get_insights(df):
 
     return insights
 
-def get_period_fact_of_day():
-    """Returns a period fact based on the current day."""
-    from datetime import date
-
-    facts = [
-        {
-            'fact': "The average menstrual cycle lasts 28 days, but anywhere from 21 to 35 days is considered normal.",
-            'icon': '📅',
-            'tip': 'Track your cycle to understand your unique pattern!'
-        },
-        {
-            'fact': "Period blood isn't actually just blood - it's a mix of blood, tissue from the uterine lining, and vaginal secretions.",
-            'icon': '🔬',
-            'tip': 'Changes in color and consistency are usually normal.'
-        },
-        {
-            'fact': "You lose about 2-3 tablespoons of blood during your entire period, though it can feel like much more!",
-            'icon': '💧',
-            'tip': 'Heavy bleeding (more than 80ml) should be discussed with a doctor.'
-        },
-        {
-            'fact': "Period cramps happen because your uterus contracts to shed its lining. Prostaglandins are the chemicals responsible.",
-            'icon': '💪',
-            'tip': 'Heat, exercise, and anti-inflammatory medications can help!'
-        },
-        {
-            'fact': "Your metabolism can increase slightly during your period, which is why you might feel hungrier!",
-            'icon': '🍽️',
-            'tip': 'Listen to your body and nourish it with what it needs.'
-        },
-        {
-            'fact': "PMS symptoms can start up to 2 weeks before your period and affect up to 90% of menstruating people.",
-            'icon': '🧠',
-            'tip': 'Tracking your symptoms can help you prepare and cope better.'
-        },
-        {
-            'fact': "Exercise during your period can actually help reduce cramps and improve your mood through endorphin release.",
-            'icon': '🏃‍♀️',
-            'tip': 'Even gentle movement like walking or stretching counts!'
-        },
-        {
-            'fact': "The first day of your period is considered Day 1 of your menstrual cycle.",
-            'icon': '🌟',
-            'tip': 'This is when hormones are at their lowest before starting to rise again.'
-        },
-        {
-            'fact': "Chocolate cravings during your period are real! Your body needs more magnesium, and chocolate is rich in it.",
-            'icon': '🍫',
-            'tip': 'Dark chocolate is a great source of magnesium and iron.'
-        },
-        {
-            'fact': "Your sense of smell can be heightened during certain phases of your menstrual cycle.",
-            'icon': '👃',
-            'tip': 'This is linked to hormonal changes throughout your cycle.'
-        },
-        {
-            'fact': "Period pain that interferes with daily activities could be a sign of endometriosis or other conditions.",
-            'icon': '⚠️',
-            'tip': 'Don\'t ignore severe pain - consult a healthcare provider.'
-        },
-        {
-            'fact': "Your period can affect your sleep quality due to hormonal fluctuations, especially progesterone levels.",
-            'icon': '😴',
-            'tip': 'Prioritize rest and maintain good sleep hygiene during your cycle.'
-        },
-        {
-            'fact': "The menstrual cycle is divided into 4 phases: menstruation, follicular, ovulation, and luteal.",
-            'icon': '🔄',
-            'tip': 'Each phase has unique hormonal patterns and potential mood effects.'
-        },
-        {
-            'fact': "Stress can affect your menstrual cycle, potentially causing it to be late, early, or skipped entirely.",
-            'icon': '🧘‍♀️',
-            'tip': 'Stress management techniques can help regulate your cycle.'
-        },
-        {
-            'fact': "Period products have evolved significantly - from pads and tampons to menstrual cups and period underwear!",
-            'icon': '🌸',
-            'tip': 'Find what works best for your body and lifestyle.'
-        },
-        {
-            'fact': "Your energy levels naturally fluctuate throughout your cycle - it's not just in your head!",
-            'icon': '⚡',
-            'tip': 'Plan important tasks during your high-energy phases when possible.'
-        },
-        {
-            'fact': "The color of your period blood can tell you things about your health - bright red is fresh, dark is older blood.",
-            'icon': '🎨',
-            'tip': 'Very pale or gray discharge should be checked by a doctor.'
-        },
-        {
-            'fact': "You can still get pregnant during your period, though it's less likely. Ovulation timing varies!",
-            'icon': '💡',
-            'tip': 'Use contraception consistently if pregnancy prevention is important.'
-        },
-        {
-            'fact': "Orgasms can help relieve menstrual cramps by releasing endorphins and relaxing the uterine muscles.",
-            'icon': '💕',
-            'tip': 'Self-care comes in many forms - do what feels right for you!'
-        },
-        {
-            'fact': "The average person will menstruate for about 7 years of their lifetime!",
-            'icon': '⏰',
-            'tip': 'That\'s why understanding and tracking your cycle is so valuable.'
-        },
-        {
-            'fact': "Hydration is extra important during your period - it can help reduce bloating and headaches.",
-            'icon': '💦',
-            'tip': 'Aim for at least 8 glasses of water throughout the day.'
-        },
-        {
-            'fact': "Iron levels can drop during menstruation due to blood loss, which may cause fatigue.",
-            'icon': '🥬',
-            'tip': 'Eat iron-rich foods like leafy greens, beans, and lean meats.'
-        },
-        {
-            'fact': "Period apps and trackers can help predict your next period and identify patterns in your cycle.",
-            'icon': '📱',
-            'tip': 'You\'re already doing this - great job taking charge of your health!'
-        },
-        {
-            'fact': "Hormonal birth control works by preventing ovulation, which is why some people don't get periods on it.",
-            'icon': '💊',
-            'tip': 'Talk to your doctor about what\'s right for your body.'
-        },
-        {
-            'fact': "Mood changes during your cycle are linked to fluctuating levels of estrogen and progesterone.",
-            'icon': '🎭',
-            'tip': 'Tracking your moods can help you understand and prepare for these changes.'
-        },
-        {
-            'fact': "Ancient cultures celebrated menstruation as a sign of fertility and feminine power.",
-            'icon': '🏛️',
-            'tip': 'Your body is capable of amazing things!'
-        },
-        {
-            'fact': "The word 'menstruation' comes from Latin 'mensis' meaning 'month' - linked to lunar cycles.",
-            'icon': '🌙',
-            'tip': 'Many cultures have connected menstrual cycles to moon phases.'
-        },
-        {
-            'fact': "Everyone's period is different - what's normal for you might not be normal for someone else.",
-            'icon': '✨',
-            'tip': 'Trust your body and speak up if something feels wrong.'
-        },
-        {
-            'fact': "Fiber-rich foods can help with period symptoms by regulating hormones and reducing bloating.",
-            'icon': '🥦',
-            'tip': 'Include whole grains, fruits, and vegetables in your diet.'
-        },
-        {
-            'fact': "Your pain tolerance can actually decrease during menstruation due to hormonal changes.",
-            'icon': '🌡️',
-            'tip': 'Be extra gentle with yourself during this time.'
-        },
-        {
-            'fact': "Regular exercise can help regulate your menstrual cycle and reduce PMS symptoms.",
-            'icon': '🤸‍♀️',
-            'tip': 'Find activities you enjoy to make it sustainable long-term.'
-        }
-    ]
+# Period facts, one shown per day (read-only)
+_PERIOD_FACTS = tuple(MappingProxyType(fact) for fact in (
+    {
+        'fact': "The average menstrual cycle lasts 28 days, but anywhere from 21 to 35 days is considered normal.",
+        'icon': '📅',
+        'tip': 'Track your cycle to understand your unique pattern!'
+    },
+    {
+        'fact': "Period blood isn't actually just blood - it's a mix of blood, tissue from the uterine lining, and vaginal secretions.",
+        'icon': '🔬',
+        'tip': 'Changes in color and consistency are usually normal.'
+    },
+    {
+        'fact': "You lose about 2-3 tablespoons of blood during your entire period, though it can feel like much more!",
+        'icon': '💧',
+        'tip': 'Heavy bleeding (more than 80ml) should be discussed with a doctor.'
+    },
+    {
+        'fact': "Period cramps happen because your uterus contracts to shed its lining. Prostaglandins are the chemicals responsible.",
+        'icon': '💪',
+        'tip': 'Heat, exercise, and anti-inflammatory medications can help!'
+    },
+    {
+        'fact': "Your metabolism can increase slightly during your period, which is why you might feel hungrier!",
+        'icon': '🍽️',
+        'tip': 'Listen to your body and nourish it with what it needs.'
+    },
+    {
+        'fact': "PMS symptoms can start up to 2 weeks before your period and affect up to 90% of menstruating people.",
+        'icon': '🧠',
+        'tip': 'Tracking your symptoms can help you prepare and cope better.'
+    },
+    {
+        'fact': "Exercise during your period can actually help reduce cramps and improve your mood through endorphin release.",
+        'icon': '🏃‍♀️',
+        'tip': 'Even gentle movement like walking or stretching counts!'
+    },
+    {
+        'fact': "The first day of your period is considered Day 1 of your menstrual cycle.",
+        'icon': '🌟',
+        'tip': 'This is when hormones are at their lowest before starting to rise again.'
+    },
+    {
+        'fact': "Chocolate cravings during your period are real! Your body needs more magnesium, and chocolate is rich in it.",
+        'icon': '🍫',
+        'tip': 'Dark chocolate is a great source of magnesium and iron.'
+    },
+    {
+        'fact': "Your sense of smell can be heightened during certain phases of your menstrual cycle.",
+        'icon': '👃',
+        'tip': 'This is linked to hormonal changes throughout your cycle.'
+    },
+    {
+        'fact': "Period pain that interferes with daily activities could be a sign of endometriosis or other conditions.",
+        'icon': '⚠️',
+        'tip': 'Don\'t ignore severe pain - consult a healthcare provider.'
+    },
+    {
+        'fact': "Your period can affect your sleep quality due to hormonal fluctuations, especially progesterone levels.",
+        'icon': '😴',
+        'tip': 'Prioritize rest and maintain good sleep hygiene during your cycle.'
+    },
+    {
+        'fact': "The menstrual cycle is divided into 4 phases: menstruation, follicular, ovulation, and luteal.",
+        'icon': '🔄',
+        'tip': 'Each phase has unique hormonal patterns and potential mood effects.'
+    },
+    {
+        'fact': "Stress can affect your menstrual cycle, potentially causing it to be late, early, or skipped entirely.",
+        'icon': '🧘‍♀️',
+        'tip': 'Stress management techniques can help regulate your cycle.'
+    },
+    {
+        'fact': "Period products have evolved significantly - from pads and tampons to menstrual cups and period underwear!",
+        'icon': '🌸',
+        'tip': 'Find what works best for your body and lifestyle.'
+    },
+    {
+        'fact': "Your energy levels naturally fluctuate throughout your cycle - it's not just in your head!",
+        'icon': '⚡',
+        'tip': 'Plan important tasks during your high-energy phases when possible.'
+    },
+    {
+        'fact': "The color of your period blood can tell you things about your health - bright red is fresh, dark is older blood.",
+        'icon': '🎨',
+        'tip': 'Very pale or gray discharge should be checked by a doctor.'
+    },
+    {
+        'fact': "You can still get pregnant during your period, though it's less likely. Ovulation timing varies!",
+        'icon': '💡',
+        'tip': 'Use contraception consistently if pregnancy prevention is important.'
+    },
+    {
+        'fact': "Orgasms can help relieve menstrual cramps by releasing endorphins and relaxing the uterine muscles.",
+        'icon': '💕',
+        'tip': 'Self-care comes in many forms - do what feels right for you!'
+    },
+    {
+        'fact': "The average person will menstruate for about 7 years of their lifetime!",
+        'icon': '⏰',
+        'tip': 'That\'s why understanding and tracking your cycle is so valuable.'
+    },
+    {
+        'fact': "Hydration is extra important during your period - it can help reduce bloating and headaches.",
+        'icon': '💦',
+        'tip': 'Aim for at least 8 glasses of water throughout the day.'
+    },
+    {
+        'fact': "Iron levels can drop during menstruation due to blood loss, which may cause fatigue.",
+        'icon': '🥬',
+        'tip': 'Eat iron-rich foods like leafy greens, beans, and lean meats.'
+    },
+    {
+        'fact': "Period apps and trackers can help predict your next period and identify patterns in your cycle.",
+        'icon': '📱',
+        'tip': 'You\'re already doing this - great job taking charge of your health!'
+    },
+    {
+        'fact': "Hormonal birth control works by preventing ovulation, which is why some people don't get periods on it.",
+        'icon': '💊',
+        'tip': 'Talk to your doctor about what\'s right for your body.'
+    },
+    {
+        'fact': "Mood changes during your cycle are linked to fluctuating levels of estrogen and progesterone.",
+        'icon': '🎭',
+        'tip': 'Tracking your moods can help you understand and prepare for these changes.'
+    },
+    {
+        'fact': "Ancient cultures celebrated menstruation as a sign of fertility and feminine power.",
+        'icon': '🏛️',
+        'tip': 'Your body is capable of amazing things!'
+    },
+    {
+        'fact': "The word 'menstruation' comes from Latin 'mensis' meaning 'month' - linked to lunar cycles.",
+        'icon': '🌙',
+        'tip': 'Many cultures have connected menstrual cycles to moon phases.'
+    },
+    {
+        'fact': "Everyone's period is different - what's normal for you might not be normal for someone else.",
+        'icon': '✨',
+        'tip': 'Trust your body and speak up if something feels wrong.'
+    },
+    {
+        'fact': "Fiber-rich foods can help with period symptoms by regulating hormones and reducing bloating.",
+        'icon': '🥦',
+        'tip': 'Include whole grains, fruits, and vegetables in your diet.'
+    },
+    {
+        'fact': "Your pain tolerance can actually decrease during menstruation due to hormonal changes.",
+        'icon': '🌡️',
+        'tip': 'Be extra gentle with yourself during this time.'
+    },
+    {
+        'fact': "Regular exercise can help regulate your menstrual cycle and reduce PMS symptoms.",
+        'icon': '🤸‍♀️',
+        'tip': 'Find activities you enjoy to make it sustainable long-term.'
+    }
+))
 
+def get_period_fact_of_day(day_ordinal=None):
+    """Returns a period fact for the given day (date.toordinal()), defaulting to today."""
+    day = datetime.date.fromordinal(day_ordinal) if day_ordinal else datetime.date.today()
     # Use day of year to get consistent fact for the day
-    day_of_year = date.today().timetuple().tm_yday
-    fact_index = day_of_year % len(facts)
+    return _PERIOD_FACTS[day.timetuple().tm_yday % len(_PERIOD_FACTS)]
+
+@st.cache_data(ttl="1d", show_spinner=False)
+def render_fact_of_day(day_ordinal):
+    """Returns the fact-of-the-day card HTML; rendered once per calendar day."""
+    fact_data = get_period_fact_of_day(day_ordinal)
+    return _FACT_CARD_TEMPLATE.format(
+        icon=fact_data['icon'],
+        fact=fact_data['fact'],
+        tip=fact_data['tip']
+    )
+
+def empty_history():
+    """Returns an empty history DataFrame with the columns load_user_history produces."""
+    return pd.DataFrame(columns=['id'] + HISTORY_COLUMNS + ['Date_Display'])
+
+def _normalize_history(df):
+    """Applies the history column types shared by loaded and appended rows."""
+    # Confidence and emotion scores are softmax probabilities: convert the
+    # NUMERIC (Decimal) columns to float32 in one pass, selected by name
+    score_columns = ['Confidence Score'] + EMOTION_SCORE_COLUMNS
+    df[score_columns] = df[score_columns].astype(np.float32)
+    df['Emotion Label'] = df['Emotion Label'].astype(EMOTION_LABEL_DTYPE)
+    # Cycle days are 1-7: a compact int8, cast once here rather than by each reader
+    df['Period Day'] = df['Period Day'].astype(np.int8)
+    # psycopg already returns datetimes; this only fixes the dtype of an empty result
+    df['Date'] = pd.to_datetime(df['Date'])
+    # Create a formatted date column for display (without seconds)
+    df['Date_Display'] = df['Date'].dt.strftime('%Y-%m-%d %H:%M')
+    return df
+
+def load_user_history(pool, user_id):
+    """Loads historical data for the logged-in user; errors are raised to the caller."""
+    query = """
+    SELECT id, entry_date, period_day, summary, emotion_label, confidence_score,
+           joy_score, sadness_score, anger_score, fear_score, surprise_score, disgust_score, neutral_score,
+           symptom_cramps, symptom_headache, symptom_bloating, symptom_fatigue, symptom_acne,
+           symptom_back_pain, symptom_nausea, symptom_breast_tenderness, symptom_mood_swings, symptom_insomnia
+    FROM journal_entries WHERE user_id = %s ORDER BY entry_date DESC;
+    """
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(query, [user_id])
+        rows = cur.fetchall()
+    # Build the DataFrame with the application's column names directly;
+    # 'id' is kept internally as a cheap change marker (see _history_hash)
+    return _normalize_history(pd.DataFrame(rows, columns=['id'] + HISTORY_COLUMNS))
+
+def merge_history(df, new_entries):
+    """Merges new_entries into the history, keeping the newest-first order."""
+    if df.empty:
+        return new_entries
+    if new_entries.empty:
+        return df
+
+    combined = pd.concat([new_entries, df], ignore_index=True)
+    return combined.sort_values('Date', ascending=False, kind='mergesort', ignore_index=True)
+
+def append_history_entry(df, entry_id, entry):
+    """Returns the history with one newly saved entry added."""
+    new_row = _normalize_history(pd.DataFrame([(entry_id, *entry)], columns=['id'] + HISTORY_COLUMNS))
+    return merge_history(df, new_row)
+
+@st.cache_resource
+def _history_versions():
+    """Process-wide map of user_id -> history version, shared by all sessions."""
+    return {}
 
-    return facts[fact_index]
+@st.cache_resource
+def _history_versions_lock():
+    """Process-wide lock guarding updates to _history_versions()."""
+    return threading.Lock()
+
+def get_history_version(user_id):
+    """Returns the current history version for a user."""
+    return _history_versions().get(user_id, 0)
+
+def bump_history_version(user_id):
+    """Marks a user's journal entries as changed and returns the new version."""
+    # Script threads of concurrent sessions bump at the same time; without the
+    # lock two saves could both get seen + 1 and each append only its own row
+    with _history_versions_lock():
+        versions = _history_versions()
+        versions[user_id] = versions.get(user_id, 0) + 1
+        return versions[user_id]
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_user_history_cached(_pool, user_id, cache_token):
+    """Cached load_user_history, keyed on cache_token (the user's history version)."""
+    return load_user_history(_pool, user_id)
+
+def sync_user_history(pool, user_id):
+    """Brings st.session_state.history_df up to date for the user."""
+    current = get_history_version(user_id)
+    seen = st.session_state.get('history_version')
+    loaded = 'history_df' in st.session_state and st.session_state.get('history_user') == user_id
+    if loaded and seen == current:
+        return
 
-def load_user_history(conn, user_id):
-    """Loads all historical data for the logged-in user."""
-    query = "SELECT * FROM journal_entries WHERE user_id = %s ORDER BY entry_date DESC;"
     try:
-        # Rename columns to match the application's expected DataFrame columns
-        df = pd.read_sql(query, conn, params=[user_id])
-        df.columns = [
-            'id', 'User ID', 'Date', 'Period Day', 'Summary', 'Emotion Label', 'Confidence Score',
-            'Joy_Score', 'Sadness_Score', 'Anger_Score', 'Fear_Score', 'Surprise_Score', 'Disgust_Score', 'Neutral_Score',
-            'Symptom_Cramps', 'Symptom_Headache', 'Symptom_Bloating', 'Symptom_Fatigue', 'Symptom_Acne',
-            'Symptom_Back_Pain', 'Symptom_Nausea', 'Symptom_Breast_Tenderness', 'Symptom_Mood_Swings', 'Symptom_Insomnia'
-        ]
-        # Ensure correct data types and format datetime
-        df['Date'] = pd.to_datetime(df['Date'])
-        # Create a formatted date column for display (without seconds)
-        df['Date_Display'] = df['Date'].dt.strftime('%Y-%m-%d %H:%M')
-        return df.drop(columns=['id', 'User ID']) # Drop internal columns for app display
+        history_df = load_user_history_cached(pool, user_id, current)
     except Exception as e:
-        # If table doesn't exist yet or other load error, return an empty structure
+        # If table doesn't exist yet or other load error, keep the session out of
+        # sync so the next run retries; show an empty history if nothing is loaded
         st.warning(f"No history found or error loading data. Start logging! ({e})")
-        return pd.DataFrame(columns=[
-            'Date', 'Period Day', 'Summary', 'Emotion Label', 'Confidence Score',
-            'Joy_Score', 'Sadness_Score', 'Anger_Score', 'Fear_Score', 'Surprise_Score', 'Disgust_Score', 'Neutral_Score',
-            'Symptom_Cramps', 'Symptom_Headache', 'Symptom_Bloating', 'Symptom_Fatigue', 'Symptom_Acne',
-            'Symptom_Back_Pain', 'Symptom_Nausea', 'Symptom_Breast_Tenderness', 'Symptom_Mood_Swings', 'Symptom_Insomnia'
-        ])
+        if not loaded:
+            st.session_state.history_df = empty_history()
+            st.session_state.history_user = user_id
+            st.session_state.history_version = None
+        return
+
+    st.session_state.history_df = history_df
+    st.session_state.history_user = user_id
+    st.session_state.history_version = current
+
+def record_saved_entry(pool, user_id, entry_id, entry):
+    """Updates the session history after this session saved an entry."""
+    seen = st.session_state.get('history_version')
+    new_version = bump_history_version(user_id)
+    if seen is not None and new_version == seen + 1:
+        # Nothing else changed since the last sync: add the entry in memory
+        st.session_state.history_df = append_history_entry(st.session_state.history_df, entry_id, entry)
+        st.session_state.history_version = new_version
+    else:
+        sync_user_history(pool, user_id)
 
-def delete_all_user_entries(conn, user_id):
+def delete_all_user_entries(pool, user_id):
     """Deletes all journal entries for the specified user."""
+    # Single statement, committed when the connection is returned; rowcount gives
+    # the number removed without a separate COUNT(*). The user_id-leading journal
+    # index turns the WHERE into an index range scan.
     query = "DELETE FROM journal_entries WHERE user_id = %s;"
     try:
-        with conn.cursor() as cur:
+        with pool.connection() as conn, conn.cursor() as cur:
             cur.execute(query, [user_id])
             deleted_count = cur.rowcount
-            conn.commit()
+        bump_history_version(user_id)
         return True, deleted_count
     except Exception as e:
-        conn.rollback()
         return False, str(e)
 
-def delete_user_account(conn, username):
+def delete_user_account(pool, username):
     """Permanently deletes a user account and all associated data."""
     try:
-        with conn.cursor() as cur:
+        # Both deletes run in one transaction, committed when the connection is returned
+        with pool.connection() as conn, conn.cursor() as cur:
             # First delete all journal entries
             delete_entries_query = "DELETE FROM journal_entries WHERE user_id = %s;"
             cur.execute(delete_entries_query, [username])
@@ -567,34 +760,569 @@ def delete_user_account(conn, username):
             delete_user_query = "DELETE FROM users WHERE username = %s;"
             cur.execute(delete_user_query, [username])
             user_deleted = cur.rowcount
-
-            conn.commit()
+        bump_history_version(username)
 
         if user_deleted > 0:
             return True, f"Account deleted successfully. {entries_deleted} journal entries removed."
         else:
             return False, "User not found in database."
     except Exception as e:
-        conn.rollback()
         return False, str(e)
 
+def history_fingerprint(df, user_id):
+    """Cheap cache key for a user's history that changes whenever entries are added or removed."""
+    return (user_id, *_history_hash(df))
+
+# Vibrant color palette for emotions, shared by the trend lines and cycle-day bars (read-only)
+_EMOTION_LINE_COLORS = MappingProxyType({
+    'joy': '#FFD700',
+    'sadness': '#4169E1',
+    'anger': '#FF6B35',
+    'fear': '#7B68EE',
+    'surprise': '#FF8C00',
+    'disgust': '#32CD32',
+    'neutral': '#9E9E9E'
+})
+
+@st.cache_data(ttl="1h", max_entries=64, show_spinner=False)
+def build_mood_figure(df_key, _df):
+    """Builds the mood trend and cycle-day figure as a dict, cached on df_key."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    show_cycle = len(_df) >= 2
+    # Spline smoothing and per-point markers get costly to draw in the browser
+    # for long histories; plain lines are enough to read the trend there
+    compact = len(_df) > 100
+    titles = ['Your Emotional Journey ✨']
+    if show_cycle:
+        titles.append('How Emotions Vary Throughout Your Cycle 💫')
+    fig = make_subplots(rows=len(titles), cols=1, subplot_titles=titles, vertical_spacing=0.15)
+
+    # Top: confidence of each entry, one line per dominant emotion
+    trend_emotions = set()
+    for emotion, group in _df.groupby('Emotion Label', observed=True):
+        group = group.sort_values('Date')
+        trend_emotions.add(emotion)
+        fig.add_trace(go.Scatter(
+            x=group['Date'],
+            y=group['Confidence Score'],
+            mode='lines' if compact else 'lines+markers',
+            name=emotion,
+            legendgroup=emotion,
+            line=dict(shape='linear' if compact else 'spline', width=3, color=_EMOTION_LINE_COLORS.get(emotion))
+        ), row=1, col=1)
+
+    fig.update_yaxes(range=[0, 1.1], title_text='Confidence Score', row=1, col=1)
+    fig.update_xaxes(tickformat='%Y-%m-%d %H:%M', row=1, col=1)
+
+    # Bottom: average score of every emotion per cycle day
+    if show_cycle:
+        day_avg = _df.groupby('Period Day')[EMOTION_SCORE_COLUMNS].mean()
+        for emotion, col in zip(EMOTION_LABELS, EMOTION_SCORE_COLUMNS):
+            fig.add_trace(go.Bar(
+                x=day_avg.index,
+                y=day_avg[col],
+                name=emotion,
+                legendgroup=emotion,
+                showlegend=emotion not in trend_emotions,
+                marker_color=_EMOTION_LINE_COLORS[emotion]
+            ), row=2, col=1)
+
+        fig.update_yaxes(range=[0, 0.7], title_text='Average Confidence Score', row=2, col=1)
+        fig.update_xaxes(title_text='Day of Menstruation', dtick=1, row=2, col=1)
+
+    fig.update_layout(
+        height=450 * len(titles),
+        barmode='group',
+        plot_bgcolor='#FFF9F5',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=13, color='#5D4E60'),
+        legend=dict(
+            title_text='Emotion',
+            bgcolor='#FFFFFF',
+            bordercolor='#FFB366',
+            borderwidth=2
+        ),
+        hovermode='x unified',
+        # Keep zoom and toggled legend items across reruns and new entries
+        uirevision='history'
+    )
+    fig.update_annotations(font=dict(size=19, color='#7B68EE', family='Arial'))
+
+    return fig.to_dict()
+
+@st.cache_data(ttl="1h", max_entries=64, show_spinner=False)
+def build_display_history(df_key, _df):
+    """Returns the journal table and CSV columns, cached on df_key."""
+    # Date_Display is formatted once when rows are loaded or appended, so this
+    # is only a column selection (HISTORY_COLUMNS order, formatted date first)
+    display_df = _df[['Date_Display'] + HISTORY_COLUMNS[1:]]
+    return display_df.rename(columns={'Date_Display': 'Date & Time'})
+
+@st.cache_data(ttl="1h", max_entries=64, show_spinner=False)
+def history_csv_bytes(df_key, _df):
+    """Encodes the history table as CSV once per data change (see history_fingerprint)."""
+    return _df.to_csv(index=False).encode('utf-8')
+
+@st.fragment
+def render_account_settings(pool):
+    """Renders the sidebar reset and delete-account controls as a fragment."""
+    with st.expander("🗑️ Reset All Data"):
+        st.warning("⚠️ This will permanently delete ALL your journal entries. This action cannot be undone!")
+
+        # Confirmation checkbox
+        confirm_reset = st.checkbox("I understand that this will delete all my data")
+
+        if st.button("🔴 Delete All Entries", disabled=not confirm_reset, type="secondary"):
+            if confirm_reset:
+                success, result = delete_all_user_entries(pool, st.session_state['username'])
+                if success:
+                    st.success(f"✅ Successfully deleted {result} entries!")
+                    # Clear session state; the next sync reloads from the database
+                    st.session_state.history_df = empty_history()
+                    st.session_state.history_version = None
+                    st.rerun()
+                else:
+                    st.error(f"❌ Error deleting entries: {result}")
+
+    with st.expander("⚠️ Delete Account"):
+        st.error("🚨 DANGER ZONE")
+        st.warning("⚠️ This will permanently delete your entire account including all journal entries, personal data, and settings. This action CANNOT be undone!")
+
+        st.markdown("---")
+        st.markdown("**Before you proceed:**")
+        st.markdown("- All your journal entries will be lost forever")
+        st.markdown("- Your account will be completely removed from the system")
+        st.markdown("- You will need to create a new account to use the app again")
+
+        st.markdown("---")
+
+        # Confirmation checkbox
+        confirm_delete_account = st.checkbox("I understand this action is permanent and cannot be reversed")
+
+        # Additional text input for extra confirmation
+        username_confirmation = st.text_input(
+            "Type your username to confirm:",
+            key="username_confirm",
+            placeholder=st.session_state['username']
+        )
+
+        # Check if username matches
+        username_matches = username_confirmation == st.session_state['username']
+
+        if st.button(
+            "🔴 PERMANENTLY DELETE ACCOUNT",
+            disabled=not (confirm_delete_account and username_matches),
+            type="secondary",
+            key="delete_account_button"
+        ):
+            if confirm_delete_account and username_matches:
+                success, message = delete_user_account(pool, st.session_state['username'])
+                if success:
+                    load_users_from_db_cached.clear()
+                    st.success(f"✅ {message}")
+                    st.info("👋 Your account has been deleted. Logging you out...")
+                    # Clear all session state
+                    for key in list(st.session_state.keys()):
+                        del st.session_state[key]
+                    st.balloons()
+                    # Wait a moment then rerun to show login screen
+                    import time
+                    time.sleep(2)
+                    st.rerun()
+                else:
+                    st.error(f"❌ Error deleting account: {message}")
+
+# =======================================================
+# UI TEMPLATES
+# =======================================================
+
+# Built once at import; cards with dynamic content only fill in their fields
+
+# Orange & purple theme, emitted with st.html so it skips the markdown parser
+_THEME_CSS = """
+<style>
+    /* Orange and Purple color theme */
+    :root {
+        --primary-color: #FF6B35;
+        --secondary-color: #7B68EE;
+        --accent-color: #FFA07A;
+    }
+
+    /* Smooth fade-in animation */
+    @keyframes fadeIn {
+        from {
+            opacity: 0;
+            transform: translateY(10px);
+        }
+        to {
+            opacity: 1;
+            transform: translateY(0);
+        }
+    }
+
+    /* Pulse animation for metrics */
+    @keyframes pulse {
+        0%, 100% {
+            transform: scale(1);
+        }
+        50% {
+            transform: scale(1.05);
+        }
+    }
+
+    /* Colorful form styling with animation */
+    .stForm {
+        background: linear-gradient(135deg, #FFF4E6 0%, #F3E5F5 100%);
+        padding: 2rem;
+        border-radius: 12px;
+        border: 2px solid #FFB366;
+        animation: fadeIn 0.5s ease-out;
+        transition: all 0.3s ease;
+    }
+
+    .stForm:hover {
+        box-shadow: 0 8px 16px rgba(255, 107, 53, 0.15);
+        transform: translateY(-2px);
+    }
+
+    /* Styled text inputs with focus effect */
+    .stTextArea textarea {
+        border-radius: 8px;
+        border: 2px solid #FFB366;
+        font-size: 15px;
+        background-color: white;
+        transition: all 0.3s ease;
+    }
+
+    .stTextArea textarea:focus {
+        border-color: #7B68EE;
+        box-shadow: 0 0 0 3px rgba(123, 104, 238, 0.1);
+    }
+
+    /* Orange-Purple gradient buttons with enhanced hover */
+    .stButton > button {
+        background: linear-gradient(135deg, #FF6B35 0%, #7B68EE 100%);
+        color: white;
+        border-radius: 20px;
+        padding: 0.7rem 2rem;
+        font-weight: 600;
+        border: none;
+        transition: all 0.3s ease;
+        position: relative;
+        overflow: hidden;
+    }
+
+    .stButton > button:hover {
+        transform: translateY(-3px);
+        box-shadow: 0 6px 20px rgba(255, 107, 53, 0.4);
+    }
+
+    .stButton > button:active {
+        transform: translateY(-1px);
+    }
+
+    /* Vibrant metrics with pulse on hover */
+    [data-testid="stMetricValue"] {
+        font-size: 2rem;
+        font-weight: 700;
+        color: #FF6B35;
+        transition: all 0.3s ease;
+    }
+
+    [data-testid="stMetric"]:hover [data-testid="stMetricValue"] {
+        animation: pulse 1s ease-in-out;
+    }
+
+    /* Colorful headers with smooth appearance */
+    h1 {
+        color: #7B68EE;
+        text-align: center;
+        font-weight: 700;
+        animation: fadeIn 0.6s ease-out;
+    }
+
+    h2, h3 {
+        color: #FF6B35;
+        font-weight: 600;
+        animation: fadeIn 0.5s ease-out;
+    }
+
+    /* Gradient sidebar with smooth transition */
+    [data-testid="stSidebar"] {
+        background: linear-gradient(180deg, #FFF4E6 0%, #F3E5F5 100%);
+    }
+
+    [data-testid="stSidebar"] [data-testid="stMetric"] {
+        background: rgba(255, 255, 255, 0.6);
+        padding: 0.8rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+        transition: all 0.3s ease;
+    }
+
+    [data-testid="stSidebar"] [data-testid="stMetric"]:hover {
+        background: rgba(255, 255, 255, 0.9);
+        transform: translateX(5px);
+    }
+
+    /* Success messages with slide-in */
+    .stSuccess {
+        background-color: #D4EDDA;
+        border-radius: 10px;
+        padding: 1rem;
+        border-left: 4px solid #28A745;
+        animation: fadeIn 0.4s ease-out;
+    }
+
+    /* Info messages */
+    .stInfo {
+        animation: fadeIn 0.4s ease-out;
+    }
+
+    /* Expander styling with hover effect */
+    .streamlit-expanderHeader {
+        background-color: #FFF4E6;
+        border-radius: 8px;
+        font-weight: 600;
+        border: 1px solid #FFB366;
+        transition: all 0.3s ease;
+    }
+
+    .streamlit-expanderHeader:hover {
+        background-color: #FFE4CC;
+        border-color: #FF6B35;
+    }
+
+    /* Clean white background */
+    .main {
+        background-color: #FFFFFF;
+    }
+
+    /* Better text colors */
+    p, label, span {
+        color: #333333;
+    }
+
+    /* Dataframe hover effect */
+    .stDataFrame {
+        animation: fadeIn 0.5s ease-out;
+    }
+
+    /* Chart containers with fade-in */
+    [data-testid="stPlotlyChart"] {
+        animation: fadeIn 0.6s ease-out;
+    }
+
+    /* ==================== MOBILE RESPONSIVE DESIGN ==================== */
+
+    /* Tablets and smaller (below 768px) */
+    @media only screen and (max-width: 768px) {
+        /* Reduce form padding on mobile */
+        .stForm {
+            padding: 1.5rem;
+            margin: 1rem 0;
+        }
+
+        /* Slightly smaller fonts for mobile */
+        h1 {
+            font-size: 2rem;
+        }
+
+        h2 {
+            font-size: 1.5rem;
+        }
+
+        h3 {
+            font-size: 1.3rem;
+        }
+
+        /* Make buttons full width on mobile */
+        .stButton > button {
+            width: 100%;
+            padding: 0.8rem 1.5rem;
+        }
+
+        /* Better touch targets for inputs */
+        input, textarea, select {
+            font-size: 16px; /* Prevents zoom on iOS */
+            padding: 0.75rem;
+        }
+
+        /* Add spacing around charts to prevent overlap */
+        [data-testid="stPlotlyChart"] {
+            margin: 1.5rem 0;
+            padding: 0.5rem 0;
+        }
+
+        /* Ensure text doesn't overlap with charts */
+        .element-container {
+            margin-bottom: 1rem;
+        }
+
+        /* Better spacing for expanders */
+        .streamlit-expanderHeader {
+            padding: 1rem;
+            margin: 0.5rem 0;
+        }
+    }
+
+    /* Small phones (below 480px) */
+    @media only screen and (max-width: 480px) {
+        .stForm {
+            padding: 1rem;
+        }
+
+        h1 {
+            font-size: 1.7rem;
+        }
+
+        h2 {
+            font-size: 1.4rem;
+        }
+
+        h3 {
+            font-size: 1.2rem;
+        }
+
+        /* Extra spacing around charts on small screens */
+        [data-testid="stPlotlyChart"] {
+            margin: 2rem 0;
+        }
+    }
+
+    /* Large screens - optimize for desktop */
+    @media only screen and (min-width: 1200px) {
+        .block-container {
+            max-width: 1200px;
+            margin: 0 auto;
+        }
+    }
+
+    /* Ensure images and iframes are responsive */
+    img, iframe {
+        max-width: 100%;
+        height: auto;
+    }
+
+    /* Responsive tables */
+    .dataframe {
+        overflow-x: auto;
+        display: block;
+        margin: 1rem 0;
+    }
+
+    /* Prevent text overlap with any element */
+    div[data-testid="stVerticalBlock"] > div {
+        margin-bottom: 0.5rem;
+    }
+
+    /* Better spacing for markdown elements */
+    .stMarkdown {
+        margin: 0.75rem 0;
+    }
+</style>
+"""
+
+_SIDEBAR_HEADER_HTML = """
+<div style='text-align: center; padding: 1rem 0; background: linear-gradient(135deg, #FFB366 0%, #FF6B35 100%);
+            border-radius: 10px; margin-bottom: 1rem;'>
+    <h2 style='color: white; margin: 0; font-size: 1.5rem;'>🌸</h2>
+    <p style='color: white; margin: 0.5rem 0 0 0; font-size: 0.9rem;'>Cycle Tracker</p>
+</div>
+"""
+
+_INTRO_HTML = """
+<div style='text-align: center; padding: 1.5rem;
+            background: linear-gradient(135deg, #FFF4E6 0%, #F3E5F5 100%);
+            border-radius: 12px; margin-bottom: 2rem; border: 2px solid #FFB366;'>
+    <p style='font-size: 1.1rem; color: #5D4E60; margin: 0; line-height: 1.7; font-weight: 500;'>
+        Track your mood and symptoms during your cycle to understand patterns over time ✨
+    </p>
+</div>
+"""
+
+_FACT_CARD_TEMPLATE = """
+<div style='background: linear-gradient(135deg, #E8F5E9 0%, #FCE4EC 100%);
+            padding: 1.5rem; border-radius: 15px; margin-bottom: 2rem;
+            border-left: 6px solid #FF6B35; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
+    <h3 style='color: #FF6B35; margin-top: 0; font-size: 1.3rem;'>
+        {icon} Did You Know? - Fact of the Day
+    </h3>
+    <p style='font-size: 1.05rem; color: #2D3436; line-height: 1.8; margin: 0.8rem 0;'>
+        <strong>{fact}</strong>
+    </p>
+    <div style='background: rgba(255,255,255,0.7); padding: 0.8rem;
+                border-radius: 8px; margin-top: 1rem;'>
+        <p style='margin: 0; color: #7B68EE; font-weight: 500;'>
+            💡 <em>{tip}</em>
+        </p>
+    </div>
+</div>
+"""
+
+_MAP_HEADER_HTML = """
+<div style='text-align: center; padding: 0.5rem; margin-bottom: 1rem;'>
+    <h3 style='color: #FF6B35; margin: 0;'>🌏 Global Community Map</h3>
+    <p style='color: #7B68EE; margin: 0.5rem 0 0 0; font-size: 0.9rem;'>
+        Click and drag to explore • Scroll to zoom in/out
+    </p>
+</div>
+"""
+
+_REFLECTION_CARD_TEMPLATE = """
+<div style='background: linear-gradient(135deg, #FFFBF0 0%, #F8F4FF 100%);
+            padding: 1.5rem; border-radius: 12px; margin: 1rem 0;
+            border-left: 5px solid {color};'>
+    <h4 style='color: {color}; margin-top: 0;'>💭 A Moment of Reflection</h4>
+    <p style='font-style: italic; color: #5D4E60; font-size: 1.05rem; line-height: 1.6;'>
+        "{quote}"
+    </p>
+    <hr style='border: none; border-top: 1px solid #E0D8E8; margin: 1rem 0;'>
+    <h4 style='color: #FF6B35; margin-bottom: 0.5rem;'>🌿 Wellness Tip</h4>
+    <p style='color: #5D4E60; line-height: 1.6;'>{tip}</p>
+    <hr style='border: none; border-top: 1px solid #E0D8E8; margin: 1rem 0;'>
+    <h4 style='color: #7B68EE; margin-bottom: 0.5rem;'>📅 Cycle Day {period_day} Insight</h4>
+    <p style='color: #5D4E60; line-height: 1.6;'>{cycle_advice}</p>
+</div>
+"""
+
+_FOOTER_HTML = """
+<div style='text-align: center; padding: 1rem;'>
+    <p style='color: #7B68EE; font-size: 1rem; font-weight: 500;'>
+        💜 Developed with care by Rouba 🌸
+    </p>
+    <p style='color: #FF6B35; font-size: 0.9rem;'>
+        Understanding your cycle, one day at a time ✨
+    </p>
+</div>
+"""
+
 # =======================================================
 # INITIALIZE DATABASE AND LOAD USERS
 # =======================================================
 
 # Initialize database connection and create tables
-conn = init_db_connection()
-create_table_if_not_exists(conn)
+pool = init_db_pool()
+create_table_if_not_exists(pool)
 
 # Load users from database and merge with config users
-db_users = load_users_from_db(conn)
+try:
+    db_users = load_users_from_db_cached(pool)
+except Exception:
+    # If table doesn't exist or error, continue with config users only; the
+    # failure is not cached, so the next rerun tries the database again
+    db_users = {}
 if db_users:
     # Merge database users with config users (config users take precedence)
     for username, user_data in db_users.items():
         if username not in config['credentials']['usernames']:
             config['credentials']['usernames'][username] = user_data
 
-# Re-initialize authenticator with updated user list
+# Re-initialize authenticator with updated user list. Built on every run: its
+# cookie manager reads the browser cookies when constructed, so a reused
+# instance would never see them and "remember me" logins would break
 authenticator = stauth.Authenticate(
     config['credentials'],
     config['cookie']['name'],
@@ -681,9 +1409,11 @@ if st.session_state.get("authentication_status") != True:
                     country_to_save = new_country if new_country else None
 
                     # Register user in database
-                    success, result = register_user(conn, new_username, new_email, new_name, hashed_password, country_to_save)
+                    success, result = register_user(pool, new_username, new_email, new_name, hashed_password, country_to_save)
 
                     if success:
+                        # Make the new account visible to the authenticator immediately
+                        load_users_from_db_cached.clear()
                         st.success(f"✅ Account created successfully! User ID: {result}")
                         st.info("👉 Please switch to the Login tab to sign in with your new account.")
                         # Force a rerun to reload users from database
@@ -707,318 +1437,33 @@ if st.session_state.get("authentication_status") == None:
 
 if st.session_state.get("authentication_status"):
     # Initialize all resources once login is successful
-    # (conn is already initialized at the top for user authentication)
-    emotion_analyzer = load_emotion_pipeline()
+    # (pool is already initialized at the top for user authentication)
+    load_emotion_model()
 
     # --- Custom CSS for Orange & Purple Styling with Animations ---
-    st.markdown("""
-    <style>
-        /* Orange and Purple color theme */
-        :root {
-            --primary-color: #FF6B35;
-            --secondary-color: #7B68EE;
-            --accent-color: #FFA07A;
-        }
-
-        /* Smooth fade-in animation */
-        @keyframes fadeIn {
-            from {
-                opacity: 0;
-                transform: translateY(10px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-
-        /* Pulse animation for metrics */
-        @keyframes pulse {
-            0%, 100% {
-                transform: scale(1);
-            }
-            50% {
-                transform: scale(1.05);
-            }
-        }
-
-        /* Colorful form styling with animation */
-        .stForm {
-            background: linear-gradient(135deg, #FFF4E6 0%, #F3E5F5 100%);
-            padding: 2rem;
-            border-radius: 12px;
-            border: 2px solid #FFB366;
-            animation: fadeIn 0.5s ease-out;
-            transition: all 0.3s ease;
-        }
-
-        .stForm:hover {
-            box-shadow: 0 8px 16px rgba(255, 107, 53, 0.15);
-            transform: translateY(-2px);
-        }
-
-        /* Styled text inputs with focus effect */
-        .stTextArea textarea {
-            border-radius: 8px;
-            border: 2px solid #FFB366;
-            font-size: 15px;
-            background-color: white;
-            transition: all 0.3s ease;
-        }
-
-        .stTextArea textarea:focus {
-            border-color: #7B68EE;
-            box-shadow: 0 0 0 3px rgba(123, 104, 238, 0.1);
-        }
-
-        /* Orange-Purple gradient buttons with enhanced hover */
-        .stButton > button {
-            background: linear-gradient(135deg, #FF6B35 0%, #7B68EE 100%);
-            color: white;
-            border-radius: 20px;
-            padding: 0.7rem 2rem;
-            font-weight: 600;
-            border: none;
-            transition: all 0.3s ease;
-            position: relative;
-            overflow: hidden;
-        }
-
-        .stButton > button:hover {
-            transform: translateY(-3px);
-            box-shadow: 0 6px 20px rgba(255, 107, 53, 0.4);
-        }
-
-        .stButton > button:active {
-            transform: translateY(-1px);
-        }
-
-        /* Vibrant metrics with pulse on hover */
-        [data-testid="stMetricValue"] {
-            font-size: 2rem;
-            font-weight: 700;
-            color: #FF6B35;
-            transition: all 0.3s ease;
-        }
-
-        [data-testid="stMetric"]:hover [data-testid="stMetricValue"] {
-            animation: pulse 1s ease-in-out;
-        }
-
-        /* Colorful headers with smooth appearance */
-        h1 {
-            color: #7B68EE;
-            text-align: center;
-            font-weight: 700;
-            animation: fadeIn 0.6s ease-out;
-        }
-
-        h2, h3 {
-            color: #FF6B35;
-            font-weight: 600;
-            animation: fadeIn 0.5s ease-out;
-        }
-
-        /* Gradient sidebar with smooth transition */
-        [data-testid="stSidebar"] {
-            background: linear-gradient(180deg, #FFF4E6 0%, #F3E5F5 100%);
-        }
-
-        [data-testid="stSidebar"] [data-testid="stMetric"] {
-            background: rgba(255, 255, 255, 0.6);
-            padding: 0.8rem;
-            border-radius: 8px;
-            margin: 0.5rem 0;
-            transition: all 0.3s ease;
-        }
-
-        [data-testid="stSidebar"] [data-testid="stMetric"]:hover {
-            background: rgba(255, 255, 255, 0.9);
-            transform: translateX(5px);
-        }
-
-        /* Success messages with slide-in */
-        .stSuccess {
-            background-color: #D4EDDA;
-            border-radius: 10px;
-            padding: 1rem;
-            border-left: 4px solid #28A745;
-            animation: fadeIn 0.4s ease-out;
-        }
-
-        /* Info messages */
-        .stInfo {
-            animation: fadeIn 0.4s ease-out;
-        }
-
-        /* Expander styling with hover effect */
-        .streamlit-expanderHeader {
-            background-color: #FFF4E6;
-            border-radius: 8px;
-            font-weight: 600;
-            border: 1px solid #FFB366;
-            transition: all 0.3s ease;
-        }
-
-        .streamlit-expanderHeader:hover {
-            background-color: #FFE4CC;
-            border-color: #FF6B35;
-        }
-
-        /* Clean white background */
-        .main {
-            background-color: #FFFFFF;
-        }
-
-        /* Better text colors */
-        p, label, span {
-            color: #333333;
-        }
-
-        /* Dataframe hover effect */
-        .stDataFrame {
-            animation: fadeIn 0.5s ease-out;
-        }
-
-        /* Chart containers with fade-in */
-        [data-testid="stPlotlyChart"] {
-            animation: fadeIn 0.6s ease-out;
-        }
-
-        /* ==================== MOBILE RESPONSIVE DESIGN ==================== */
-
-        /* Tablets and smaller (below 768px) */
-        @media only screen and (max-width: 768px) {
-            /* Reduce form padding on mobile */
-            .stForm {
-                padding: 1.5rem;
-                margin: 1rem 0;
-            }
-
-            /* Slightly smaller fonts for mobile */
-            h1 {
-                font-size: 2rem;
-            }
-
-            h2 {
-                font-size: 1.5rem;
-            }
-
-            h3 {
-                font-size: 1.3rem;
-            }
-
-            /* Make buttons full width on mobile */
-            .stButton > button {
-                width: 100%;
-                padding: 0.8rem 1.5rem;
-            }
-
-            /* Better touch targets for inputs */
-            input, textarea, select {
-                font-size: 16px; /* Prevents zoom on iOS */
-                padding: 0.75rem;
-            }
-
-            /* Add spacing around charts to prevent overlap */
-            [data-testid="stPlotlyChart"] {
-                margin: 1.5rem 0;
-                padding: 0.5rem 0;
-            }
-
-            /* Ensure text doesn't overlap with charts */
-            .element-container {
-                margin-bottom: 1rem;
-            }
-
-            /* Better spacing for expanders */
-            .streamlit-expanderHeader {
-                padding: 1rem;
-                margin: 0.5rem 0;
-            }
-        }
-
-        /* Small phones (below 480px) */
-        @media only screen and (max-width: 480px) {
-            .stForm {
-                padding: 1rem;
-            }
-
-            h1 {
-                font-size: 1.7rem;
-            }
-
-            h2 {
-                font-size: 1.4rem;
-            }
-
-            h3 {
-                font-size: 1.2rem;
-            }
-
-            /* Extra spacing around charts on small screens */
-            [data-testid="stPlotlyChart"] {
-                margin: 2rem 0;
-            }
-        }
-
-        /* Large screens - optimize for desktop */
-        @media only screen and (min-width: 1200px) {
-            .block-container {
-                max-width: 1200px;
-                margin: 0 auto;
-            }
-        }
-
-        /* Ensure images and iframes are responsive */
-        img, iframe {
-            max-width: 100%;
-            height: auto;
-        }
-
-        /* Responsive tables */
-        .dataframe {
-            overflow-x: auto;
-            display: block;
-            margin: 1rem 0;
-        }
-
-        /* Prevent text overlap with any element */
-        div[data-testid="stVerticalBlock"] > div {
-            margin-bottom: 0.5rem;
-        }
-
-        /* Better spacing for markdown elements */
-        .stMarkdown {
-            margin: 0.75rem 0;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    st.html(_THEME_CSS)
 
     # --- UI Elements for Logged-in User ---
     authenticator.logout('Logout', 'sidebar')
 
     # Sidebar header with decorative elements
-    st.sidebar.markdown("""
-    <div style='text-align: center; padding: 1rem 0; background: linear-gradient(135deg, #FFB366 0%, #FF6B35 100%);
-                border-radius: 10px; margin-bottom: 1rem;'>
-        <h2 style='color: white; margin: 0; font-size: 1.5rem;'>🌸</h2>
-        <p style='color: white; margin: 0.5rem 0 0 0; font-size: 0.9rem;'>Cycle Tracker</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.sidebar.markdown(_SIDEBAR_HEADER_HTML, unsafe_allow_html=True)
 
     st.sidebar.markdown(f"### 👋 Welcome, {st.session_state['name']}!")
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 📊 Quick Stats")
 
     # Load data specific to the current user
-    if 'history_df' not in st.session_state:
-        st.session_state.history_df = load_user_history(conn, st.session_state['username'])
+    sync_user_history(pool, st.session_state['username'])
 
     # Add sidebar stats
     if not st.session_state.history_df.empty:
-        # Calculate streak
-        streak = calculate_streak(st.session_state.history_df)
+        # Calculate streak, recomputed only when the user, history or day changes
+        streak_key = (st.session_state['username'], st.session_state.history_version, datetime.date.today())
+        if st.session_state.get('streak_key') != streak_key:
+            st.session_state.streak = calculate_streak(st.session_state.history_df)
+            st.session_state.streak_key = streak_key
+        streak = st.session_state.streak
         st.sidebar.metric("🔥 Current Streak", f"{streak} days")
 
         # Show insights
@@ -1045,122 +1490,27 @@ if st.session_state.get("authentication_status"):
     st.sidebar.markdown("---")
     st.sidebar.markdown("### ⚙️ Settings")
 
-    with st.sidebar.expander("🗑️ Reset All Data"):
-        st.warning("⚠️ This will permanently delete ALL your journal entries. This action cannot be undone!")
-
-        # Confirmation checkbox
-        confirm_reset = st.checkbox("I understand that this will delete all my data")
-
-        if st.button("🔴 Delete All Entries", disabled=not confirm_reset, type="secondary"):
-            if confirm_reset:
-                success, result = delete_all_user_entries(conn, st.session_state['username'])
-                if success:
-                    st.success(f"✅ Successfully deleted {result} entries!")
-                    # Clear session state to reload empty data
-                    st.session_state.history_df = pd.DataFrame(columns=[
-                        'Date', 'Period Day', 'Summary', 'Emotion Label', 'Confidence Score',
-                        'Joy_Score', 'Sadness_Score', 'Anger_Score', 'Fear_Score', 'Surprise_Score', 'Disgust_Score', 'Neutral_Score',
-                        'Symptom_Cramps', 'Symptom_Headache', 'Symptom_Bloating', 'Symptom_Fatigue', 'Symptom_Acne',
-                        'Symptom_Back_Pain', 'Symptom_Nausea', 'Symptom_Breast_Tenderness', 'Symptom_Mood_Swings', 'Symptom_Insomnia'
-                    ])
-                    st.rerun()
-                else:
-                    st.error(f"❌ Error deleting entries: {result}")
-
-    with st.sidebar.expander("⚠️ Delete Account"):
-        st.error("🚨 DANGER ZONE")
-        st.warning("⚠️ This will permanently delete your entire account including all journal entries, personal data, and settings. This action CANNOT be undone!")
-
-        st.markdown("---")
-        st.markdown("**Before you proceed:**")
-        st.markdown("- All your journal entries will be lost forever")
-        st.markdown("- Your account will be completely removed from the system")
-        st.markdown("- You will need to create a new account to use the app again")
-
-        st.markdown("---")
-
-        # Confirmation checkbox
-        confirm_delete_account = st.checkbox("I understand this action is permanent and cannot be reversed")
-
-        # Additional text input for extra confirmation
-        username_confirmation = st.text_input(
-            "Type your username to confirm:",
-            key="username_confirm",
-            placeholder=st.session_state['username']
-        )
-
-        # Check if username matches
-        username_matches = username_confirmation == st.session_state['username']
-
-        if st.button(
-            "🔴 PERMANENTLY DELETE ACCOUNT",
-            disabled=not (confirm_delete_account and username_matches),
-            type="secondary",
-            key="delete_account_button"
-        ):
-            if confirm_delete_account and username_matches:
-                success, message = delete_user_account(conn, st.session_state['username'])
-                if success:
-                    st.success(f"✅ {message}")
-                    st.info("👋 Your account has been deleted. Logging you out...")
-                    # Clear all session state
-                    for key in list(st.session_state.keys()):
-                        del st.session_state[key]
-                    st.balloons()
-                    # Wait a moment then rerun to show login screen
-                    import time
-                    time.sleep(2)
-                    st.rerun()
-                else:
-                    st.error(f"❌ Error deleting account: {message}")
+    with st.sidebar:
+        render_account_settings(pool)
 
     # --- App Structure ---
     st.title("🌸 Menstrual Mood Tracker")
-    st.markdown("""
-    <div style='text-align: center; padding: 1.5rem;
-                background: linear-gradient(135deg, #FFF4E6 0%, #F3E5F5 100%);
-                border-radius: 12px; margin-bottom: 2rem; border: 2px solid #FFB366;'>
-        <p style='font-size: 1.1rem; color: #5D4E60; margin: 0; line-height: 1.7; font-weight: 500;'>
-            Track your mood and symptoms during your cycle to understand patterns over time ✨
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_INTRO_HTML, unsafe_allow_html=True)
 
     # Display Fact of the Day
-    fact_data = get_period_fact_of_day()
-    st.markdown(f"""
-    <div style='background: linear-gradient(135deg, #E8F5E9 0%, #FCE4EC 100%);
-                padding: 1.5rem; border-radius: 15px; margin-bottom: 2rem;
-                border-left: 6px solid #FF6B35; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
-        <h3 style='color: #FF6B35; margin-top: 0; font-size: 1.3rem;'>
-            {fact_data['icon']} Did You Know? - Fact of the Day
-        </h3>
-        <p style='font-size: 1.05rem; color: #2D3436; line-height: 1.8; margin: 0.8rem 0;'>
-            <strong>{fact_data['fact']}</strong>
-        </p>
-        <div style='background: rgba(255,255,255,0.7); padding: 0.8rem;
-                    border-radius: 8px; margin-top: 1rem;'>
-            <p style='margin: 0; color: #7B68EE; font-weight: 500;'>
-                💡 <em>{fact_data['tip']}</em>
-            </p>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    # The date is passed in so the cached card rolls over at midnight
+    st.markdown(render_fact_of_day(datetime.date.today().toordinal()), unsafe_allow_html=True)
 
     # --- World Map of Users ---
     with st.expander("🌍 Community World Map", expanded=False):
-        st.markdown("""
-        <div style='text-align: center; padding: 0.5rem; margin-bottom: 1rem;'>
-            <h3 style='color: #FF6B35; margin: 0;'>🌏 Global Community Map</h3>
-            <p style='color: #7B68EE; margin: 0.5rem 0 0 0; font-size: 0.9rem;'>
-                Click and drag to explore • Scroll to zoom in/out
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_MAP_HEADER_HTML, unsafe_allow_html=True)
 
-        user_locations = get_user_locations(conn)
+        user_locations = get_user_locations(pool)
 
         if not user_locations.empty:
+            import plotly.express as px
+            import plotly.graph_objects as go
+
             # Create a choropleth map with filled countries
             fig = px.choropleth(
                 user_locations,
@@ -1229,9 +1579,6 @@ if st.session_state.get("authentication_status"):
             )
 
             # Add small star markers on top for better visibility when zoomed out
-            import plotly.graph_objects as go
-
-            # Add marker trace on top
             fig.add_trace(go.Scattergeo(
                 locations=user_locations['country'],
                 locationmode="country names",
@@ -1344,34 +1691,26 @@ if st.session_state.get("authentication_status"):
     # --- Analysis and Logging ---
     if submit_button and user_summary:
 
-        emotion_label, confidence_score, results = analyze_emotion(user_summary, emotion_analyzer)
+        emotion_label, confidence_score, results = analyze_emotion(user_summary)
         # Combine date and time
         from datetime import datetime as dt
         log_datetime = dt.combine(entry_date, entry_time)
         log_date_str = log_datetime.strftime("%Y-%m-%d %H:%M")
         
-        # Prepare data for dictionary (required for insertion)
-        entry_dict = {
-            'User ID': st.session_state['username'], # Used for DB insertion
-            'Date': log_date_str,
-            'Period Day': period_day,
-            'Summary': user_summary,
-            'Emotion Label': emotion_label,
-            'Confidence Score': confidence_score,
-        }
-        for item in results:
-            entry_dict[f"{item['label'].capitalize()}_Score"] = item['score']
+        # Per-emotion scores keyed by lowercase label (one pass over the results)
+        scores = {item['label'].lower(): item['score'] for item in results}
 
         # --- SAVE DATA TO POSTGRESQL ---
         try:
-            with conn.cursor() as cur:
+            with pool.connection() as conn, conn.cursor() as cur:
                 INSERT_SQL = """
                 INSERT INTO journal_entries
                 (user_id, entry_date, period_day, summary, emotion_label, confidence_score,
                  joy_score, sadness_score, anger_score, fear_score, surprise_score, disgust_score, neutral_score,
                  symptom_cramps, symptom_headache, symptom_bloating, symptom_fatigue, symptom_acne,
                  symptom_back_pain, symptom_nausea, symptom_breast_tenderness, symptom_mood_swings, symptom_insomnia)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id;
                 """
 
                 data = (
@@ -1381,18 +1720,19 @@ if st.session_state.get("authentication_status"):
                     user_summary,
                     emotion_label,
                     confidence_score,
-                    entry_dict['Joy_Score'], entry_dict['Sadness_Score'], entry_dict['Anger_Score'],
-                    entry_dict['Fear_Score'], entry_dict['Surprise_Score'], entry_dict['Disgust_Score'],
-                    entry_dict['Neutral_Score'],
+                    *(scores[label] for label in EMOTION_LABELS),
                     symptom_cramps, symptom_headache, symptom_bloating, symptom_fatigue, symptom_acne,
                     symptom_back_pain, symptom_nausea, symptom_breast_tenderness, symptom_mood_swings, symptom_insomnia
                 )
 
-                cur.execute(INSERT_SQL, data)
-                conn.commit()
-            
-            # After successful DB insert, reload the user's data to update the session state
-            st.session_state.history_df = load_user_history(conn, st.session_state['username'])
+                # Prepared server-side on first use, so each pooled connection
+                # parses and plans the INSERT only once
+                cur.execute(INSERT_SQL, data, prepare=True)
+                entry_id = cur.fetchone()[0]
+
+            # After successful DB insert, add the entry to the in-memory history
+            # instead of reloading the whole journal
+            record_saved_entry(pool, st.session_state['username'], entry_id, data[1:])
 
             # --- Immediate Feedback (Aesthetic Update) ---
             st.markdown("<br>", unsafe_allow_html=True)
@@ -1423,26 +1763,16 @@ if st.session_state.get("authentication_status"):
             st.markdown("</div>", unsafe_allow_html=True)
 
             # Personalized Wellness Content
-            st.markdown(f"""
-            <div style='background: linear-gradient(135deg, #FFFBF0 0%, #F8F4FF 100%);
-                        padding: 1.5rem; border-radius: 12px; margin: 1rem 0;
-                        border-left: 5px solid {emotion_content['color']};'>
-                <h4 style='color: {emotion_content['color']}; margin-top: 0;'>💭 A Moment of Reflection</h4>
-                <p style='font-style: italic; color: #5D4E60; font-size: 1.05rem; line-height: 1.6;'>
-                    "{emotion_content['quote']}"
-                </p>
-                <hr style='border: none; border-top: 1px solid #E0D8E8; margin: 1rem 0;'>
-                <h4 style='color: #FF6B35; margin-bottom: 0.5rem;'>🌿 Wellness Tip</h4>
-                <p style='color: #5D4E60; line-height: 1.6;'>{emotion_content['tip']}</p>
-                <hr style='border: none; border-top: 1px solid #E0D8E8; margin: 1rem 0;'>
-                <h4 style='color: #7B68EE; margin-bottom: 0.5rem;'>📅 Cycle Day {period_day} Insight</h4>
-                <p style='color: #5D4E60; line-height: 1.6;'>{emotion_content['cycle_advice']}</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_REFLECTION_CARD_TEMPLATE.format(
+                color=emotion_content['color'],
+                quote=emotion_content['quote'],
+                tip=emotion_content['tip'],
+                period_day=period_day,
+                cycle_advice=emotion_content['cycle_advice']
+            ), unsafe_allow_html=True)
 
         except Exception as e:
             st.error(f"Failed to save entry to database. Details: {e}")
-            conn.rollback()
         
         st.markdown("---")
 
@@ -1451,114 +1781,21 @@ if st.session_state.get("authentication_status"):
     # =======================================================
     if not st.session_state.history_df.empty:
 
+        import plotly.express as px
+
         st.markdown("<br><br>", unsafe_allow_html=True)
         st.markdown("---")
-        plot_df = st.session_state.history_df.copy()
+        # Charts only read from the history, so use it directly rather than a copy
+        plot_df = st.session_state.history_df
+        history_key = history_fingerprint(plot_df, st.session_state['username'])
 
-        # --- Line Chart: Confidence Trend ---
+        # --- Mood Trend and Emotional Patterns by Cycle Day (one figure) ---
         st.header("📈 Mood Trend Over Time")
 
-        # Vibrant color palette for emotions
-        emotion_colors = {
-            'joy': '#FFD700',
-            'sadness': '#4169E1',
-            'anger': '#FF6B35',
-            'fear': '#7B68EE',
-            'surprise': '#FF8C00',
-            'disgust': '#32CD32',
-            'neutral': '#9E9E9E'
-        }
-
-        fig = px.line(
-            plot_df,
-            x='Date',
-            y='Confidence Score',
-            color='Emotion Label',
-            title='Your Emotional Journey ✨',
-            markers=True,
-            line_shape='spline',
-            color_discrete_map=emotion_colors
-        )
-
-        fig.update_layout(
-            yaxis_range=[0, 1.1],
-            plot_bgcolor='#FFF9F5',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(size=13, color='#5D4E60'),
-            title_font=dict(size=19, color='#7B68EE', family='Arial'),
-            legend=dict(
-                bgcolor='#FFFFFF',
-                bordercolor='#FFB366',
-                borderwidth=2
-            ),
-            xaxis=dict(
-                tickformat='%Y-%m-%d %H:%M'
-            ),
-            hovermode='x unified'
-        )
-
-        fig.update_traces(line=dict(width=3))
-        st.plotly_chart(fig, use_container_width=True)
-
-        # --- Grouped Bar Chart: Aggregation by Period Day ---
-        st.markdown("---")
-        st.header("🗓️ Emotional Patterns by Cycle Day")
-
-        emotion_cols = [
-            'Joy_Score', 'Sadness_Score', 'Anger_Score',
-            'Fear_Score', 'Surprise_Score', 'Disgust_Score', 'Neutral_Score'
-        ]
-
-        # Check if necessary columns exist and we have enough data
-        if all(col in st.session_state.history_df.columns for col in emotion_cols) and len(st.session_state.history_df) >= 2:
-
-            plot_df['Period Day'] = plot_df['Period Day'].astype(int)
+        mood_fig = build_mood_figure(history_key, plot_df)
+        st.plotly_chart(mood_fig, use_container_width=True)
 
-            melted_df = plot_df.melt(
-                id_vars=['Period Day'],
-                value_vars=emotion_cols,
-                var_name='Emotion',
-                value_name='Average Confidence'
-            )
-
-            period_agg = melted_df.groupby(['Period Day', 'Emotion'])['Average Confidence'].mean().reset_index()
-
-            fig_period = px.bar(
-                period_agg,
-                x='Period Day',
-                y='Average Confidence',
-                color='Emotion',
-                barmode='group',
-                title='How Emotions Vary Throughout Your Cycle 💫',
-                color_discrete_map={
-                    'Joy_Score': '#FFD700',
-                    'Sadness_Score': '#4169E1',
-                    'Anger_Score': '#FF6B35',
-                    'Fear_Score': '#7B68EE',
-                    'Surprise_Score': '#FF8C00',
-                    'Disgust_Score': '#32CD32',
-                    'Neutral_Score': '#9E9E9E'
-                }
-            )
-
-            fig_period.update_layout(
-                yaxis_range=[0, 0.7],
-                legend_title_text='Emotion Type',
-                xaxis_title="Day of Menstruation",
-                yaxis_title="Average Confidence Score",
-                plot_bgcolor='#FFF9F5',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=13, color='#5D4E60'),
-                title_font=dict(size=19, color='#7B68EE', family='Arial'),
-                legend=dict(
-                    bgcolor='#FFFFFF',
-                    bordercolor='#FFB366',
-                    borderwidth=2
-                ),
-                xaxis=dict(dtick=1)
-            )
-            st.plotly_chart(fig_period, use_container_width=True)
-        else:
+        if len(plot_df) < 2:
             st.info("Log at least two entries with different cycle days to see pattern comparisons.")
 
         # --- Symptom Tracking Visualization ---
@@ -1573,11 +1810,8 @@ if st.session_state.get("authentication_status"):
         # Check if symptom columns exist and we have symptom data
         if all(col in st.session_state.history_df.columns for col in symptom_cols):
             # Calculate symptom frequency by cycle day
-            symptom_data = plot_df[['Period Day'] + symptom_cols].copy()
-
-            # Convert boolean to int for counting
-            for col in symptom_cols:
-                symptom_data[col] = symptom_data[col].astype(int)
+            # Select the columns and convert boolean to int for counting in one step
+            symptom_data = plot_df[['Period Day'] + symptom_cols].astype({col: int for col in symptom_cols})
 
             # Group by period day and sum symptoms
             symptom_by_day = symptom_data.groupby('Period Day')[symptom_cols].sum().reset_index()
@@ -1656,28 +1890,11 @@ if st.session_state.get("authentication_status"):
         with col_header:
             st.header("📖 Your Journal History")
         with col_export:
-            # Prepare display dataframe with formatted dates
-            display_df = st.session_state.history_df.copy()
-            if 'Date_Display' in display_df.columns:
-                # Base columns
-                display_columns = ['Date_Display', 'Period Day', 'Summary', 'Emotion Label', 'Confidence Score',
-                                 'Joy_Score', 'Sadness_Score', 'Anger_Score', 'Fear_Score',
-                                 'Surprise_Score', 'Disgust_Score', 'Neutral_Score']
-
-                # Add symptom columns if they exist
-                symptom_cols = [
-                    'Symptom_Cramps', 'Symptom_Headache', 'Symptom_Bloating', 'Symptom_Fatigue', 'Symptom_Acne',
-                    'Symptom_Back_Pain', 'Symptom_Nausea', 'Symptom_Breast_Tenderness', 'Symptom_Mood_Swings', 'Symptom_Insomnia'
-                ]
-                for col in symptom_cols:
-                    if col in display_df.columns:
-                        display_columns.append(col)
-
-                display_df = display_df[display_columns]
-                display_df = display_df.rename(columns={'Date_Display': 'Date & Time'})
+            # Display dataframe (column subset + rename), built once per data change
+            display_df = build_display_history(history_key, st.session_state.history_df)
 
             # Export button
-            csv = display_df.to_csv(index=False).encode('utf-8')
+            csv = history_csv_bytes((history_key, tuple(display_df.columns)), display_df)
             st.download_button(
                 label="📥 Export CSV",
                 data=csv,
@@ -1686,8 +1903,14 @@ if st.session_state.get("authentication_status"):
                 help="Download your journal entries as a CSV file"
             )
 
+        # History is kept newest-first, so the latest entries need no reordering
+        max_rows = 200
+        show_all = False
+        if len(display_df) > max_rows:
+            show_all = st.checkbox(f"Show all {len(display_df)} entries", key="show_all_history")
+
         st.dataframe(
-            display_df.iloc[::-1],
+            display_df if show_all else display_df.head(max_rows),
             width='stretch',
             height=400
         )
@@ -1697,13 +1920,4 @@ if st.session_state.get("authentication_status"):
     # --- Footer Credit ---
     st.markdown("<br><br>", unsafe_allow_html=True)
     st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; padding: 1rem;'>
-        <p style='color: #7B68EE; font-size: 1rem; font-weight: 500;'>
-            💜 Developed with care by Rouba 🌸
-        </p>
-        <p style='color: #FF6B35; font-size: 0.9rem;'>
-            Understanding your cycle, one day at a time ✨
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)